@@ -3,99 +3,107 @@ ComfyUI Wan2.2 Prompt Generation Plugin - Core Node Class
 """
 
 import json
+import logging
 import os
-import traceback
-import base64
-from io import BytesIO
+import re
+import sys
 
-# Try importing PIL, use a mock if it fails
+# Try importing orjson for faster template parsing, fall back to json
 try:
-    from PIL import Image
+    from orjson import loads as _json_loads
 except ImportError:
-    Image = None
+    _json_loads = json.loads
 
-# Try importing requests
-try:
-    import requests
-except ImportError:
-    requests = None
+# Resolved once at import; load_templates reuses them instead of recomputing per call
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+_TEMPLATES_PATH = os.path.join(_MODULE_DIR, "wan22_templates.json")
 
-# Try importing utils module, create a mock if it fails
-try:
-    from .utils import logger, log_function_call, safe_json_load, validate_api_key, handle_api_error, ErrorHandler
-except ImportError:
-    # Create mock objects for testing
-    class MockLogger:
-        def info(self, msg): print(f"[INFO] {msg}")
-        def error(self, msg): print(f"[ERROR] {msg}")
+# Default option selections and the subject types that pick a camera preset
+_NO_EMOTION = "No Specific Emotion"
+_NO_ACTION = "No Specific Action"
+_NO_LIGHT = "No Lighting Effect"
+_CHAR = "Character"
+_OBJ = "Object"
 
-    logger = MockLogger()
+# Required template sections: (key holding the entries, None for the section itself;
+# text field of each entry, None when the entry itself is the text)
+_REQUIRED_SECTIONS = {
+    "character camera presets": ("presets", "template"),
+    "object camera presets": ("presets", "template"),
+    "lighting effects library": ("effects", None),
+    "character action presets": ("actions", "description"),
+    "emotional expression presets": (None, "description"),
+}
 
-    def log_function_call(func):
-        return func
+# Matches both capitalizations of the generic subject placeholder in one pass
+_SUBJECT_RE = re.compile(r"[Ss]ubject")
 
-    def safe_json_load(path):
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+# Returned by IS_CHANGED; NaN never equals itself, so ComfyUI always re-runs the node
+_NAN = float("nan")
 
-    def validate_api_key(key, provider):
-        return True, "OK"
+# Try importing utils module, fall back to a silent library logger if it fails
+try:
+    from .utils import logger, log_function_call, ErrorHandler, DEBUG as _DEBUG
+    handle_node_error = ErrorHandler.handle_node_error
+except ImportError:
+    # Per-prompt debug output goes nowhere without the plugin logger
+    _DEBUG = False
 
-    def handle_api_error(error, provider):
-        return f"{provider} API Error: {str(error)}"
+    logger = logging.getLogger(__name__)
+    logger.addHandler(logging.NullHandler())
 
-    class ErrorHandler:
-        @staticmethod
-        def validate_inputs(**kwargs):
-            pass
+    def log_function_call(func):
+        return func
 
-        @staticmethod
-        def handle_node_error(node_name, method_name, error):
-            return (f"Node {node_name}.{method_name} failed: {str(error)}",)
+    def handle_node_error(node_name, method_name, error):
+        return (f"Node {node_name}.{method_name} failed: {str(error)}",)
 
 class Wan22PromptGenerator:
     """
     Wan2.2 Prompt Generator Node
     """
+    # Parsed templates, shared by every instance and classmethod
+    _templates_cache = None
+
     def __init__(self):
-        self.templates = self.load_templates()
+        self.templates = _TEMPLATES
+
+    @classmethod
+    def load_templates(cls):
+        """Safely load JSON templates (parsed once, then served from the class cache)"""
+        if cls._templates_cache is not None:
+            return cls._templates_cache
 
-    @staticmethod
-    def load_templates():
-        """Safely load JSON templates"""
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        json_path = os.path.join(current_dir, "wan22_templates.json")
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(_TEMPLATES_PATH, 'rb') as f:
+                templates = _json_loads(f.read())
+            _validate_templates(templates)
+
+            # Reverse indexes so presets resolve with a single dict lookup
+            templates["_index"] = {
+                "action_by_selection": _index_by_selection(templates["character action presets"]["actions"], "description"),
+                "emotion_by_name": {
+                    name: preset.get("description", "")
+                    for name, preset in templates["emotional expression presets"].items()
+                },
+                "character_camera_by_selection": _index_by_selection(templates["character camera presets"]["presets"], "template"),
+                "object_camera_by_selection": _index_by_selection(templates["object camera presets"]["presets"], "template"),
+            }
+
+            # Intern the index keys; they live for the whole session
+            for index_name, index in templates["_index"].items():
+                templates["_index"][index_name] = _intern_keys(index)
         except Exception as e:
             logger.error(f"Failed to load wan22_templates.json: {str(e)}")
             return None
 
+        cls._templates_cache = templates
+        return cls._templates_cache
+
     @classmethod
     def INPUT_TYPES(cls):
         """Define node input types"""
-        templates = cls.load_templates()
-        if not templates:
-            return {}
-        
-        options_map = templates.get("parameter_options", {})
-        
-        logger.info(f"Loaded parameter options: {list(options_map.keys())}")
-        for k, v in options_map.items():
-            logger.info(f"{k}: {len(v)} options")
-        
-        return {
-            "required": {
-                "subject_type": (options_map.get("subject_type", []),),
-                "custom_subject": ("STRING", {"multiline": False, "default": ""}),
-                "character_camera_type": (options_map.get("character_camera_type", []), {"default": "No Specific Action"}),
-                "object_camera_type": (options_map.get("object_camera_type", []), {"default": "No Specific Action"}),
-                "lighting_type": (options_map.get("lighting_type", []), {"default": "No Lighting Effect"}),
-                "character_action": (options_map.get("character_action", []), {"default": "No Specific Action"}),
-                "emotional_expression": (options_map.get("emotional_expression", []), {"default": "No Specific Emotion"})
-            }
-        }
+        return _INPUT_TYPES_SCHEMA
 
     RETURN_TYPES = ("STRING",)
     RETURN_NAMES = ("prompt",)
@@ -106,94 +114,152 @@ class Wan22PromptGenerator:
     def generate_preset_prompt(self, subject_type, custom_subject, character_camera_type, object_camera_type, lighting_type, character_action, emotional_expression):
         """Generate a complete Wan2.2 format prompt"""
         try:
-            # Load templates again inside the function to be safe
-            self.templates = self.load_templates()
             if not self.templates:
-                return ("Error: Template file not loaded.",)
-            
-            prompt_parts = []
+                return _error("Template file not loaded.")
             
             # 1. Subject Type (mandatory)
             if not custom_subject or custom_subject.strip() == "":
-                return ("Error: Please provide a custom subject description.",)
-            
-            prompt_parts.append(custom_subject)
-            
-            # 2. Emotional Expression (if selected)
-            emotional_expression_presets = self.templates.get("emotional expression presets", {})
-            if emotional_expression != "No Specific Emotion" and emotional_expression in emotional_expression_presets:
-                emotion_description = emotional_expression_presets[emotional_expression].get("description", "")
-                prompt_parts.append(emotion_description)
-            
-            # 3. Character Action (if selected)
-            character_action_presets = self.templates.get("character action presets", {}).get("actions", {})
-            if character_action != "No Specific Action" and character_action in character_action_presets:
-                action_description = character_action_presets[character_action].get("description", "")
-                
-                # Replace the generic subject with the custom subject
-                if "subject" in action_description.lower():
-                    action_description = action_description.replace("The subject", custom_subject.capitalize())
-                
-                prompt_parts.append(action_description)
-            
-            # 4. Camera Movement (conditional based on subject type)
-            if subject_type == "Character":
-                camera_presets = self.templates.get("character camera presets", {}).get("presets", {})
-                camera_description = ""
-                for preset_id, preset_data in camera_presets.items():
-                    if preset_data.get("name") == character_camera_type:
-                        camera_description = preset_data.get("template", "")
-                        break
-                
-                if camera_description:
-                    # Replace the generic subject with the custom subject
-                    camera_description = camera_description.replace("Subject", custom_subject.capitalize()).replace("subject", custom_subject.capitalize())
-                    prompt_parts.append(camera_description)
-
-            elif subject_type == "Object":
-                camera_presets = self.templates.get("object camera presets", {}).get("presets", {})
-                camera_description = ""
-                for preset_id, preset_data in camera_presets.items():
-                    if preset_data.get("name") == object_camera_type:
-                        camera_description = preset_data.get("template", "")
-                        break
-
-                if camera_description:
-                    # Replace the generic subject with the custom subject
-                    camera_description = camera_description.replace("Subject", custom_subject.capitalize()).replace("subject", custom_subject.capitalize())
-                    prompt_parts.append(camera_description)
-
-            # 5. Lighting Effect (if selected)
-            lighting_effects = self.templates.get("lighting effects library", {}).get("effects", {})
-            if lighting_type != "No Lighting Effect" and lighting_type in lighting_effects:
-                lighting_description = lighting_effects[lighting_type]
-                
-                # Replace the generic subject with the custom subject
-                lighting_description = lighting_description.replace("Subject", custom_subject.capitalize()).replace("subject", custom_subject.capitalize())
-
-                prompt_parts.append(lighting_description)
-            
-            # Combine the final prompt
-            final_prompt = " ".join(prompt_parts)
+                return _error("Please provide a custom subject description.")
+
+            # Resolve the selected presets; the "No ..." sentinels are never index keys
+            emotion_description = _EMOTION_IDX.get(emotional_expression, "")
+            action_description = _ACTION_IDX.get(character_action, "")
+
+            # Camera movement is conditional on the subject type
+            camera_lookup = _CAMERA_BY_SUBJECT.get(subject_type)
+            camera_description = camera_lookup(character_camera_type, object_camera_type) if camera_lookup else ""
+
+            lighting_description = _LIGHTING_IDX.get(lighting_type, "")
+
+            # Replace the generic subject with the custom subject, only if a template is in use
+            if action_description or camera_description or lighting_description:
+                cap_subject = custom_subject.capitalize()
+                # Backslashes would otherwise be read as group references by re.sub
+                subject_repl = cap_subject.replace("\\", "\\\\")
+                if "The subject" in action_description:
+                    action_description = action_description.replace("The subject", cap_subject)
+                if "ubject" in camera_description:
+                    camera_description = _SUBJECT_RE.sub(subject_repl, camera_description)
+                if "ubject" in lighting_description:
+                    lighting_description = _SUBJECT_RE.sub(subject_repl, lighting_description)
+
+            # Combine the fixed slots (subject, emotion, action, camera, lighting), skipping empty ones
+            final_prompt = " ".join([
+                part for part in (custom_subject, emotion_description, action_description, camera_description, lighting_description)
+                if part
+            ])
             
-            logger.info(f"Generated WAN2.2 prompt length: {len(final_prompt)}")
-            logger.info(f"WAN2.2 prompt: {final_prompt[:100]}...")
+            if _DEBUG:
+                logger.debug("Generated WAN2.2 prompt (length %d): %s...", len(final_prompt), final_prompt[:100])
             
             return (final_prompt,)
             
         except Exception as e:
             error_msg = f"An error occurred while generating the Wan2.2 prompt: {str(e)}"
-            return ErrorHandler.handle_node_error("Wan22PromptGenerator", "generate_preset_prompt", error_msg)
+            return handle_node_error("Wan22PromptGenerator", "generate_preset_prompt", error_msg)
 
     @classmethod
     def IS_CHANGED(cls, **kwargs):
         """Prevent caching of the node's output"""
-        return float("NaN")
+        return _NAN
 
     @classmethod
     def IS_A_VALID_NODE(cls):
         """Check if the node is valid to load"""
-        return cls.load_templates() is not None
+        return _TEMPLATES is not None
+
+def _error(message):
+    """Build the node's error output"""
+    return (f"Error: {message}",)
+
+def _validate_templates(templates):
+    """Validate the template file shape once at load, so lookups need no fallbacks"""
+    if not isinstance(templates, dict):
+        raise ValueError("Template file root must be a JSON object")
+
+    errors = []
+    options_map = templates.get("parameter_options")
+    if not isinstance(options_map, dict):
+        errors.append("Missing or invalid template section: parameter_options")
+    else:
+        for key, values in options_map.items():
+            if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+                errors.append(f"Parameter options for {key} must be a list of strings")
+
+    for section, (entries_key, text_field) in _REQUIRED_SECTIONS.items():
+        entries = templates.get(section)
+        if entries_key is not None and isinstance(entries, dict):
+            entries = entries.get(entries_key)
+        if not isinstance(entries, dict):
+            errors.append(f"Missing or invalid template section: {section}")
+            continue
+
+        for entry_id, entry in entries.items():
+            if text_field is None:
+                valid = isinstance(entry, str)
+            else:
+                valid = (
+                    isinstance(entry, dict)
+                    and isinstance(entry.get(text_field), str)
+                    and isinstance(entry.get("name", ""), str)
+                )
+            if not valid:
+                errors.append(f"Invalid entry {entry_id!r} in template section: {section}")
+
+    if errors:
+        raise ValueError("; ".join(errors))
+
+def _index_by_selection(presets, field):
+    """Map every accepted selection of a preset to its field value: the preset id ("1"),
+    its name and the "id - name" label used by the dropdowns"""
+    index = {}
+    for preset_id, preset in presets.items():
+        value = preset.get(field, "")
+        name = preset.get("name")
+        index[preset_id] = value
+        # Unnamed presets are only reachable by id
+        if name:
+            index[name] = value
+            index[f"{preset_id} - {name}"] = value
+    return index
+
+def _intern_keys(mapping):
+    """Return a copy of mapping with its string keys interned"""
+    return {sys.intern(k) if isinstance(k, str) else k: v for k, v in mapping.items()}
+
+def _build_input_types(options_map):
+    """Build the INPUT_TYPES schema from the template parameter options"""
+    return {
+        "required": {
+            "subject_type": (options_map.get("subject_type", []),),
+            "custom_subject": ("STRING", {"multiline": False, "default": ""}),
+            "character_camera_type": (options_map.get("character_camera_type", []), {"default": _NO_ACTION}),
+            "object_camera_type": (options_map.get("object_camera_type", []), {"default": _NO_ACTION}),
+            "lighting_type": (options_map.get("lighting_type", []), {"default": _NO_LIGHT}),
+            "character_action": (options_map.get("character_action", []), {"default": _NO_ACTION}),
+            "emotional_expression": (options_map.get("emotional_expression", []), {"default": _NO_EMOTION})
+        }
+    }
+
+# The templates ship with the plugin and never change at runtime, so parse them,
+# build the lookup tables and derive the INPUT_TYPES schema once at import
+_TEMPLATES = Wan22PromptGenerator.load_templates()
+if _TEMPLATES:
+    _CAMERA_CHAR_IDX = _TEMPLATES["_index"]["character_camera_by_selection"]
+    _CAMERA_OBJ_IDX = _TEMPLATES["_index"]["object_camera_by_selection"]
+    _EMOTION_IDX = _TEMPLATES["_index"]["emotion_by_name"]
+    _ACTION_IDX = _TEMPLATES["_index"]["action_by_selection"]
+    _LIGHTING_IDX = _intern_keys(_TEMPLATES["lighting effects library"]["effects"])
+    _INPUT_TYPES_SCHEMA = _build_input_types(_TEMPLATES["parameter_options"])
+else:
+    _CAMERA_CHAR_IDX = _CAMERA_OBJ_IDX = _EMOTION_IDX = _ACTION_IDX = _LIGHTING_IDX = {}
+    _INPUT_TYPES_SCHEMA = {}
+
+# Camera template lookup per subject type, called with (character_camera_type, object_camera_type)
+_CAMERA_BY_SUBJECT = {
+    _CHAR: lambda character_camera, object_camera: _CAMERA_CHAR_IDX.get(character_camera, ""),
+    _OBJ: lambda character_camera, object_camera: _CAMERA_OBJ_IDX.get(object_camera, ""),
+}
 
 # Define the node mappings for ComfyUI
 NODE_CLASS_MAPPINGS = {
@@ -8,33 +8,49 @@ import json
 from datetime import datetime
 from functools import wraps
 
+def env_flag(name):
+    """Read a boolean environment variable; only "1" and "true" (any case) enable it"""
+    return os.environ.get(name, "").strip().lower() in ("1", "true")
+
+# Plugin-wide debug switch, parsed once and shared by __init__.py and nodes.py
+DEBUG = env_flag("WAN22_DEBUG")
+
+# Debug mode switches the plugin logger (and its handlers) to DEBUG level
+_LOG_LEVEL = logging.DEBUG if DEBUG else logging.INFO
+
+# Plugin log directory, resolved once at import
+_LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+
 class Wan22Logger:
     """Wan2.2 Plugin Dedicated Logger"""
     
     def __init__(self, name="Wan22Plugin"):
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(logging.INFO)
+        self.logger.setLevel(_LOG_LEVEL)
         
-        # Avoid adding handlers repeatedly
-        if not self.logger.handlers:
+        # Handlers are attached on the first log call; avoid adding them repeatedly
+        self._setup_done = bool(self.logger.handlers)
+    
+    def _ensure_setup(self):
+        """Set up the logger on first use"""
+        if not self._setup_done:
+            self._setup_done = True
             self.setup_logger()
     
     def setup_logger(self):
         """Set up the logger"""
         try:
             # Create the logs directory
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            log_dir = os.path.join(current_dir, "logs")
-            os.makedirs(log_dir, exist_ok=True)
+            os.makedirs(_LOG_DIR, exist_ok=True)
             
             # Create file handler
-            log_file = os.path.join(log_dir, f"wan22_plugin_{datetime.now().strftime('%Y%m%d')}.log")
+            log_file = os.path.join(_LOG_DIR, f"wan22_plugin_{datetime.now().strftime('%Y%m%d')}.log")
             file_handler = logging.FileHandler(log_file, encoding='utf-8')
-            file_handler.setLevel(logging.INFO)
+            file_handler.setLevel(_LOG_LEVEL)
             
             # Create console handler
             console_handler = logging.StreamHandler()
-            console_handler.setLevel(logging.INFO)
+            console_handler.setLevel(_LOG_LEVEL)
             
             # Create formatter
             formatter = logging.Formatter(
@@ -49,43 +65,53 @@ class Wan22Logger:
             self.logger.addHandler(file_handler)
             self.logger.addHandler(console_handler)
             
+            # Clean up old logs once the log directory is in use
+            cleanup_old_logs(_LOG_DIR)
+            
         except Exception as e:
             print(f"[Wan22Logger] Failed to set up logger: {str(e)}")
     
-    def info(self, message):
+    def info(self, message, *args):
         """Log informational message"""
-        self.logger.info(message)
+        self._ensure_setup()
+        self.logger.info(message, *args)
     
-    def error(self, message):
+    def error(self, message, *args):
         """Log error message"""
-        self.logger.error(message)
+        self._ensure_setup()
+        self.logger.error(message, *args)
     
-    def warning(self, message):
+    def warning(self, message, *args):
         """Log warning message"""
-        self.logger.warning(message)
+        self._ensure_setup()
+        self.logger.warning(message, *args)
     
-    def debug(self, message):
+    def debug(self, message, *args):
         """Log debug message"""
-        self.logger.debug(message)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._ensure_setup()
+            self.logger.debug(message, *args)
 
 # Global logger instance
 logger = Wan22Logger()
 
 def log_function_call(func):
     """Decorator: Log function calls"""
+    # Resolve the names once at decoration time instead of on every call
+    qualname = func.__qualname__
+    class_name = qualname.rsplit('.', 1)[0] if '.' in qualname else "Unknown"
+    func_name = func.__name__
+
     @wraps(func)
     def wrapper(*args, **kwargs):
-        func_name = func.__name__
-        class_name = args[0].__class__.__name__ if args else "Unknown"
-        
-        logger.info(f"[{class_name}] Starting execution of {func_name}")
+        logger.debug("[%s] Starting execution of %s", class_name, func_name)
         
         try:
             result = func(*args, **kwargs)
-            logger.info(f"[{class_name}] {func_name} executed successfully")
+            logger.debug("[%s] %s executed successfully", class_name, func_name)
             return result
         except Exception as e:
-            logger.error(f"[{class_name}] {func_name} failed to execute: {str(e)}")
+            logger.error("[%s] %s failed to execute: %s", class_name, func_name, e)
             raise
     
     return wrapper
@@ -196,20 +222,12 @@ def cleanup_old_logs(log_dir, keep_days=7):
         current_time = time.time()
         cutoff_time = current_time - (keep_days * 24 * 60 * 60)
         
-        for filename in os.listdir(log_dir):
-            if filename.endswith('.log'):
-                file_path = os.path.join(log_dir, filename)
-                if os.path.getctime(file_path) < cutoff_time:
-                    os.remove(file_path)
-                    logger.info(f"Cleaned up old log file: {filename}")
+        # scandir yields entries without a join per file, and DirEntry caches its stat result
+        with os.scandir(log_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.log') and entry.stat().st_ctime < cutoff_time:
+                    os.remove(entry.path)
+                    logger.info(f"Cleaned up old log file: {entry.name}")
     
     except Exception as e:
         logger.warning(f"Failed to clean up old log files: {str(e)}")
-
-# Clean up old logs when the module is loaded
-try:
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    log_dir = os.path.join(current_dir, "logs")
-    cleanup_old_logs(log_dir)
-except:
-    pass